@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3, boundscheck=False, wraparound=False
+u"""Compiled versions of clean and validate, used by brazil_types.types when built."""
+
+cimport cython
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+from libc.stdint cimport uint64_t
+from libc.string cimport memcpy, memset
+
+
+cdef inline bint _somente_digitos(const unsigned char* p, Py_ssize_t n):
+    u"""
+    Confere se os n primeiros bytes (8 <= n <= 16) são dígitos ASCII, oito bytes de cada vez (SWAR).
+
+    Os bytes 0-7 e os oito últimos são lidos como dois inteiros de 64 bits. Em cada byte, subtrair 0x30
+    liga o bit mais alto quando ele é menor que '0' e somar 0x46 liga quando é maior que '9'. O vai-um
+    ou empresta-um entre bytes só acontece a partir de um byte que já é inválido.
+    """
+    cdef uint64_t lo, hi
+    memcpy(&lo, p, 8)
+    memcpy(&hi, p + n - 8, 8)
+    return (((lo - 0x3030303030303030ULL) | (lo + 0x4646464646464646ULL) |
+             (hi - 0x3030303030303030ULL) | (hi + 0x4646464646464646ULL)) & 0x8080808080808080ULL) == 0
+
+
+cpdef str clean(object value, Py_ssize_t size):
+    u"""
+    Retorna apenas os dígitos de value, completados com zeros à esquerda até size.
+
+    Como em `digitos.lstrip('0').zfill(size)`, zeros à esquerda além de size são descartados. Retorna
+    uma string vazia se value não tiver nenhum dígito. Subclasses de str (como numpy.str_) são aceitas.
+    """
+    # str.__str__ copia o conteúdo de subclasses de str sem passar por um __str__ sobrescrito.
+    cdef str texto = value if type(value) is str else str.__str__(value)
+    cdef Py_ssize_t total = len(texto)
+    cdef Py_ssize_t inicio = size
+    cdef Py_ssize_t fim = size
+    cdef Py_UCS4 c
+    cdef char* buf = <char*>PyMem_Malloc(total + size)
+
+    if buf == NULL:
+        raise MemoryError()
+
+    try:
+        for c in texto:
+            if c >= u'0' and c <= u'9':
+                buf[fim] = <char>c
+                fim += 1
+
+        if fim == inicio:
+            return u''
+
+        while fim - inicio > size and buf[inicio] == b'0':
+            inicio += 1
+
+        if fim - inicio < size:
+            memset(buf + fim - size, b'0', size - (fim - inicio))
+            inicio = fim - size
+
+        return buf[inicio:fim].decode('ascii')
+    finally:
+        PyMem_Free(buf)
+
+
+@cython.cdivision(True)
+cpdef bint validate_cnpj(bytes data):
+    u"""Válida um CNPJ já limpo, em bytes ASCII."""
+    cdef Py_ssize_t n = len(data)
+    cdef const unsigned char* p = data
+    # Com todos os bytes sendo dígitos as somas nunca são negativas; sem sinal, o compilador troca a
+    # divisão por 11 por uma multiplicação pelo inverso e um deslocamento.
+    cdef unsigned int s1, s2, r
+    cdef int dig1, dig2
+
+    if n < 14 or not _somente_digitos(p, 14):
+        return False
+
+    s1 = (5 * p[0] + 4 * p[1] + 3 * p[2] + 2 * p[3] + 9 * p[4] + 8 * p[5] +
+          7 * p[6] + 6 * p[7] + 5 * p[8] + 4 * p[9] + 3 * p[10] + 2 * p[11] - 48 * 58)
+    s2 = (6 * p[0] + 5 * p[1] + 4 * p[2] + 3 * p[3] + 2 * p[4] + 9 * p[5] + 8 * p[6] +
+          7 * p[7] + 6 * p[8] + 5 * p[9] + 4 * p[10] + 3 * p[11] + 2 * p[12] - 48 * 64)
+
+    r = s1 % 11
+    dig1 = 11 - r if r > 1 else 0
+    r = s2 % 11
+    dig2 = 11 - r if r > 1 else 0
+
+    return p[n - 2] - 48 == dig1 and p[n - 1] - 48 == dig2
+
+
+@cython.cdivision(True)
+cpdef bint validate_cpf(bytes data):
+    u"""Válida um CPF já limpo, em bytes ASCII."""
+    cdef Py_ssize_t n = len(data)
+    cdef const unsigned char* p = data
+    cdef unsigned int s1, s2
+
+    if n < 11 or not _somente_digitos(p, 11):
+        return False
+
+    s1 = (p[0] + 2 * p[1] + 3 * p[2] + 4 * p[3] + 5 * p[4] +
+          6 * p[5] + 7 * p[6] + 8 * p[7] + 9 * p[8] - 48 * 45)
+    s2 = (p[1] + 2 * p[2] + 3 * p[3] + 4 * p[4] + 5 * p[5] +
+          6 * p[6] + 7 * p[7] + 8 * p[8] + 9 * p[9] - 48 * 45)
+
+    return p[n - 2] - 48 == <int>(s1 % 11 % 10) and p[n - 1] - 48 == <int>(s2 % 11 % 10)
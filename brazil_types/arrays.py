@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+u"""Vectorized operations over batches of data types used in Brazil (requires numpy)."""
+
+import numpy as np
+
+from brazil_types.types import CNPJ, CPF, _PESOS_CNPJ, _PESOS_CPF
+
+_PESOS = {
+    CNPJ: tuple(np.array(pesos, dtype=np.int32) for pesos in _PESOS_CNPJ),
+    CPF: tuple(np.array(pesos, dtype=np.int32) for pesos in _PESOS_CPF),
+}
+
+_TAMANHOS = {CNPJ: 14, CPF: 11}
+
+
+def _codigos(documentos, tipo):
+    u"""
+    Converte os documentos em uma matriz (N, tamanho) com o código ASCII de cada dígito.
+
+    Aceita uma matriz uint8 já nesse formato, um array de bytes de tamanho fixo (dtype 'S14'/'S11') ou
+    qualquer sequência de valores aceitos pelo construtor do tipo.
+    """
+    tamanho = _TAMANHOS[tipo]
+
+    if isinstance(documentos, np.ndarray):
+        if documentos.dtype == np.uint8 and documentos.ndim == 2 and documentos.shape[1] == tamanho:
+            return documentos
+        if documentos.dtype == np.dtype('S{0}'.format(tamanho)):
+            return np.ascontiguousarray(documentos).view(np.uint8).reshape(-1, tamanho)
+
+    documentos = [tipo.clean(documento) for documento in documentos]
+    dados = ''.join(documentos).encode('ascii')
+    if len(dados) != len(documentos) * tamanho:
+        raise ValueError("Invalid literal for {0}: more than {1} digits".format(tipo.__name__, tamanho))
+
+    return np.frombuffer(dados, dtype=np.uint8).reshape(-1, tamanho)
+
+
+def validate_many(documentos, tipo=CNPJ):
+    u"""
+    Válida um lote de documentos de uma só vez.
+
+    Retorna um array de booleanos com o resultado da validação de cada documento.
+
+    >>> validate_many(['58.414.462/0001-35', 58414462000136, '00000000000000']).tolist()
+    [True, False, True]
+    >>> validate_many(np.array([b'58414462000135', b'58414462000136']), CNPJ).tolist()
+    [True, False]
+    >>> validate_many(['581.194.436-59', 58119443650], CPF).tolist()
+    [True, False]
+    >>> validate_many(np.array(['58414462000135', '58414462000136'])).tolist()
+    [True, False]
+    >>> validate_many(np.array([b':0000000000057', b'5841446200013'], dtype='S14')).tolist()
+    [False, False]
+    """
+    digitos = _codigos(documentos, tipo) - np.uint8(ord('0'))
+    pesos1, pesos2 = _PESOS[tipo]
+
+    resto1 = digitos[:, :len(pesos1)].dot(pesos1) % 11
+    resto2 = digitos[:, :len(pesos2)].dot(pesos2) % 11
+
+    if tipo is CNPJ:
+        dig1 = (11 - resto1) * (resto1 > 1)
+        dig2 = (11 - resto2) * (resto2 > 1)
+    else:
+        dig1 = resto1 % 10
+        dig2 = resto2 % 10
+
+    # Na subtração em uint8 qualquer byte abaixo de '0' dá a volta e fica maior que 9, como os acima de '9'.
+    return (digitos <= 9).all(axis=1) & (digitos[:, -2] == dig1) & (digitos[:, -1] == dig2)
+
+
+class CNPJArray(object):
+    u"""
+    Lote de CNPJs guardado em um único array contíguo.
+
+    Os CNPJs ficam em uma matriz (N, 14) com o código ASCII de cada dígito, em vez de um objeto CNPJ por
+    documento, e as propriedades retornam arrays com o valor de todo o lote.
+
+    >>> cnpjs = CNPJArray(['58.414.462/0001-35', 58414462000136, 11222333000181])
+    >>> len(cnpjs)
+    3
+    >>> cnpjs[0]
+    <CNPJ: 58.414.462/0001-35>
+    >>> cnpjs.valid.tolist()
+    [True, False, True]
+    >>> len(cnpjs[cnpjs.valid])
+    2
+    >>> cnpjs[0, 3]
+    Traceback (most recent call last):
+        ...
+    IndexError: CNPJArray indices must select CNPJs, not digits
+    >>> cnpjs[:, 3]
+    Traceback (most recent call last):
+        ...
+    IndexError: CNPJArray indices must select CNPJs, not digits
+    >>> cnpjs[:, :5]
+    Traceback (most recent call last):
+        ...
+    IndexError: CNPJArray indices must select CNPJs, not digits
+    >>> cnpjs.raiz.tolist()
+    [b'58414462', b'58414462', b'11222333']
+    >>> cnpjs.extensao.tolist()
+    [b'0001', b'0001', b'0001']
+    """
+
+    __slots__ = ('_codigos',)
+
+    def __init__(self, cnpjs=()):
+        u"""
+        Inicia um lote de CNPJs a partir de qualquer entrada aceita por `validate_many`.
+
+        Arrays numpy são copiados, para que alterações posteriores feitas por quem chamou não mudem o lote.
+        """
+        codigos = _codigos(cnpjs, CNPJ)
+        self._codigos = codigos.copy() if isinstance(cnpjs, np.ndarray) else codigos
+
+    @property
+    def extensao(self):
+        u"""Extensão de cada CNPJ, como array de bytes (dtype 'S4')."""
+        return np.ascontiguousarray(self._codigos[:, 8:12]).view('S4')[:, 0]
+
+    @property
+    def raiz(self):
+        u"""Raiz de cada CNPJ, como array de bytes (dtype 'S8')."""
+        return np.ascontiguousarray(self._codigos[:, :8]).view('S8')[:, 0]
+
+    @property
+    def valid(self):
+        u"""Array de flags indicando quais CNPJs estão válidos."""
+        return validate_many(self._codigos, CNPJ)
+
+    def __getitem__(self, index):
+        u"""
+        Retorna o CNPJ na posição index, ou um novo lote se index for uma fatia ou máscara.
+
+        Apenas as linhas (CNPJs) podem ser indexadas; índices que selecionam dígitos geram IndexError.
+        """
+        codigos = None if isinstance(index, tuple) else self._codigos[index]
+        if codigos is None or codigos.ndim not in (1, 2) or codigos.shape[-1] != 14:
+            raise IndexError("{0} indices must select CNPJs, not digits".format(CNPJArray.__name__))
+        if codigos.ndim == 2:
+            return CNPJArray(codigos)
+        return CNPJ(codigos.tobytes())
+
+    def __len__(self):
+        u"""Quantidade de CNPJs no lote."""
+        return len(self._codigos)
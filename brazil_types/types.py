@@ -1,16 +1,197 @@
 # -*- coding: utf-8 -*-
 u"""Data types used in Brazil."""
 
-import re
-import six
+import linecache
+import sys
+from functools import lru_cache
+from operator import attrgetter
+
+try:
+    from brazil_types import _fast
+except ImportError:
+    _fast = None
+
+if _fast is None:
+    # O numba só é útil sem a extensão compilada, e importá-lo é lento.
+    try:
+        from numba import njit
+    except ImportError:
+        njit = None
+else:
+    njit = None
+
+
+class _ApenasDigitos(dict):
+    u"""Tabela para `str.translate` que descarta todo caractere que não for dígito."""
+
+    def __missing__(self, key):
+        u"""Remove o caractere."""
+        return None
+
+
+_DIGITOS = _ApenasDigitos((ord(c), ord(c)) for c in '0123456789')
+
+# Bytes removidos por `bytes.translate`, que trabalha direto sobre os bytes sem decodificar o texto.
+_NAO_DIGITOS = bytes(c for c in range(256) if not ord('0') <= c <= ord('9'))
+
+# Valor dos documentos vazios. O construtor padrão reaproveita estas instâncias, e a comparação de strings
+# do python confere a identidade antes do conteúdo, então `empty` nesses casos é uma comparação de ponteiros.
+_CNPJ_ZERO = sys.intern('0' * 14)
+_CPF_ZERO = sys.intern('0' * 11)
+
+
+# Pesos das somas ponderadas do primeiro e do segundo dígito verificador, aplicados aos dígitos a partir do início.
+_PESOS_CNPJ = ((5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2), (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2))
+_PESOS_CPF = ((1, 2, 3, 4, 5, 6, 7, 8, 9), (0, 1, 2, 3, 4, 5, 6, 7, 8, 9))
+
+_FONTE_VERIFICADORES_CNPJ = u'''
+def _verificadores_cnpj(codigos):
+    u"""Calcula os dígitos verificadores a partir dos códigos ASCII dos dígitos de um CNPJ limpo."""
+    resto = ({0}) % 11
+    dig1 = (11 - resto) * (resto > 1)
+    resto = ({1}) % 11
+    dig2 = (11 - resto) * (resto > 1)
+    return dig1, dig2
+'''
+
+_FONTE_VERIFICADORES_CPF = u'''
+def _verificadores_cpf(codigos):
+    u"""Calcula os dígitos verificadores a partir dos códigos ASCII dos dígitos de um CPF limpo."""
+    return ({0}) % 11 % 10, ({1}) % 11 % 10
+'''
+
+
+def _soma_ponderada(pesos):
+    u"""
+    Gera a expressão da soma ponderada dos códigos ASCII em `codigos`, com os pesos como constantes.
+
+    O código de '0' (48) é descontado de uma vez pela soma dos pesos.
+
+    >>> _soma_ponderada((1, 0, 3))
+    'codigos[0] + 3 * codigos[2] - 192'
+    """
+    termos = ['codigos[{0}]'.format(i) if peso == 1 else '{0} * codigos[{1}]'.format(peso, i)
+              for i, peso in enumerate(pesos) if peso]
+    return ' + '.join(termos) + ' - {0}'.format(48 * sum(pesos))
+
+
+def _gerar_verificadores(fonte, nome, pesos):
+    u"""
+    Compila uma função de cálculo dos dígitos verificadores com as somas ponderadas desenroladas.
+
+    Com os pesos embutidos no código como constantes não há laço nem leitura de tabela de pesos.
+    """
+    fonte = fonte.format(*[_soma_ponderada(p) for p in pesos])
+
+    if njit is None:
+        # Nome sintético registrado no linecache, para tracebacks e coverage mostrarem o código gerado.
+        arquivo = '<brazil_types.types:{0}>'.format(nome)
+        linecache.cache[arquivo] = (len(fonte), None, fonte.splitlines(True), arquivo)
+    else:
+        # O cache em disco do numba (cache=True) localiza a função pelo arquivo de origem e falha com um nome
+        # sintético, então aqui o código gerado é atribuído a este módulo.
+        arquivo = __file__
+
+    try:
+        codigo = compile(fonte, arquivo, 'exec')
+    except SyntaxError as erro:
+        raise SyntaxError('{0} no código gerado:\n{1}'.format(erro, fonte))
+
+    namespace = {'__name__': __name__}
+    exec(codigo, namespace)
+    return namespace[nome]
+
+
+_verificadores_cnpj = _gerar_verificadores(_FONTE_VERIFICADORES_CNPJ, '_verificadores_cnpj', _PESOS_CNPJ)
+_verificadores_cpf = _gerar_verificadores(_FONTE_VERIFICADORES_CPF, '_verificadores_cpf', _PESOS_CPF)
+
+
+if njit is not None:
+    # Com numba instalado o cálculo dos dígitos é compilado para código nativo, lendo os bytes diretamente.
+    _verificadores_cnpj = njit(cache=True)(_verificadores_cnpj)
+    _verificadores_cpf = njit(cache=True)(_verificadores_cpf)
+
+
+if _fast is not None:
+    # Extensão compilada com Cython, gerada na instalação quando o Cython está disponível.
+    _limpar = _fast.clean
+    _validar_cnpj = _fast.validate_cnpj
+    _validar_cpf = _fast.validate_cpf
+else:
+    def _limpar(texto, tamanho):
+        u"""Retorna apenas os dígitos do texto, completados com zeros à esquerda, ou '' se não houver dígitos."""
+        digitos = texto.translate(_DIGITOS)
+        if not digitos:
+            return digitos
+        if len(digitos) > tamanho:
+            digitos = digitos.lstrip('0')
+        return digitos.zfill(tamanho)
+
+    def _validar_cnpj(dados):
+        u"""Válida um CNPJ já limpo, em bytes ASCII."""
+        dig1, dig2 = _verificadores_cnpj(dados)
+        return dados[-2] - 48 == dig1 and dados[-1] - 48 == dig2
+
+    def _validar_cpf(dados):
+        u"""Válida um CPF já limpo, em bytes ASCII."""
+        dig1, dig2 = _verificadores_cpf(dados)
+        return dados[-2] - 48 == dig1 and dados[-1] - 48 == dig2
+
+
+def _limpar_bytes(dados, tamanho):
+    u"""Como `_limpar`, para bytes ou bytearray: retorna os dígitos completados com zeros, ou b'' se não houver."""
+    digitos = bytes(dados).translate(None, _NAO_DIGITOS)
+    if not digitos:
+        return digitos
+    if len(digitos) > tamanho:
+        digitos = digitos.lstrip(b'0')
+    return digitos.zfill(tamanho)
+
+
+if _fast is None and njit is None:
+    # Os mesmos documentos se repetem muito em lotes (a matriz de uma empresa em várias notas, por exemplo), então
+    # no python puro o resultado é guardado pelo valor já limpo, que é o mesmo para qualquer formatação da entrada.
+    # Com a extensão ou o numba a validação custa menos que consultar o cache.
+    _validar_cnpj = lru_cache(maxsize=8192)(_validar_cnpj)
+    _validar_cpf = lru_cache(maxsize=8192)(_validar_cpf)
+
+
+def _estado(obj):
+    u"""Atributos do objeto: os `__slots__` de toda a hierarquia de classes e o `__dict__`, se houver."""
+    estado = dict(getattr(obj, '__dict__', ()))
+    for classe in type(obj).__mro__:
+        slots = classe.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for slot in slots:
+            if slot not in ('__dict__', '__weakref__') and hasattr(obj, slot):
+                estado[slot] = getattr(obj, slot)
+    return estado
 
 
 class CommonEqualityMixin(object):
-    u"""Mixin para comparação entre objetos."""
+    u"""
+    Mixin para comparação entre objetos.
+
+    Dois objetos são iguais quando são da mesma classe e têm os mesmos atributos, estejam eles em
+    `__slots__` ou no `__dict__`:
+
+    >>> class Valor(CommonEqualityMixin):
+    ...     def __init__(self, valor):
+    ...         self.valor = valor
+    >>> Valor(1) == Valor(1)
+    True
+    >>> Valor(1) == Valor(2)
+    False
+    """
+
+    __slots__ = ()
 
     def __eq__(self, other):
         u"""Comparação de igualdade."""
-        return (isinstance(other, self.__class__) and self.__dict__ == other.__dict__)
+        if not isinstance(other, self.__class__):
+            return False
+        return _estado(self) == _estado(other)
 
     def __ne__(self, other):
         u"""Comparação de diferença."""
@@ -71,16 +252,41 @@ class CNPJ(CommonEqualityMixin):
     '0000'
     >>> cnpj.raiz
     '00000000'
+    >>> CNPJ('58.414.462/0001-35') == CNPJ(58414462000135)
+    True
+    >>> CNPJ(58414462000135) != CNPJ()
+    True
     """
 
+    __slots__ = ('_cnpj', '_formatted', '_valid')
+
     def __init__(self, cnpj=0):
         u"""Inicia um CNPJ."""
+        if isinstance(cnpj, int) and cnpj == 0:
+            self._cnpj = _CNPJ_ZERO
+            self._formatted = '00.000.000/0000-00'
+            self._valid = True
+            return
+
+        # A formatação e a validação só são calculadas no primeiro uso, veja `_formatar` e `valid`.
         self._cnpj = CNPJ.clean(cnpj)
 
+    def _formatar(self):
+        u"""CNPJ formatado, calculado no primeiro uso."""
+        try:
+            return self._formatted
+        except AttributeError:
+            cnpj = self._cnpj
+            formatted = cnpj[0:2] + '.' + cnpj[2:5] + '.' + cnpj[5:8] + '/' + cnpj[8:12] + '-' + cnpj[12:14]
+            self._formatted = formatted
+            return formatted
+
+    _FORMATOS = {'': _formatar, 'f': _formatar, 'r': attrgetter('_cnpj')}
+
     @property
     def empty(self):
         u"""Flag indicando que o valor está em branco."""
-        return int(self._cnpj) == 0
+        return self._cnpj == _CNPJ_ZERO
 
     @property
     def extensao(self):
@@ -103,7 +309,11 @@ class CNPJ(CommonEqualityMixin):
     @property
     def valid(self):
         u"""Flag indicando que o valor está válido."""
-        return CNPJ.validate(self._cnpj)
+        try:
+            return self._valid
+        except AttributeError:
+            self._valid = valid = _validar_cnpj(self._cnpj.encode('ascii'))
+            return valid
 
     def format(self, format_spec='f'):
         u"""
@@ -118,14 +328,12 @@ class CNPJ(CommonEqualityMixin):
         '58414462000135'
         >>> cnpj.format('f')
         '58.414.462/0001-35'
+        >>> cnpj.format('x')
+        Traceback (most recent call last):
+            ...
+        ValueError: Unknown format code 'x' for object of type 'CNPJ'
         """
-        if format_spec == '' or format_spec == 'f':
-            cnpj = CNPJ.clean(self._cnpj)
-            return '{0}.{1}.{2}/{3}-{4}'.format(cnpj[0:2], cnpj[2:5], cnpj[5:8], cnpj[8:12], cnpj[12:14])
-        if format_spec == 'r':
-            return self._cnpj
-        raise ValueError(
-            "Unknown format code '{0}' for object of type '{1}'".format(format_spec, CNPJ.__name__))
+        return self.__format__(format_spec)
 
     @classmethod
     def clean(cls, cnpj):
@@ -134,11 +342,24 @@ class CNPJ(CommonEqualityMixin):
 
         >>> CNPJ.clean('58.414.462/0001-35')
         '58414462000135'
+        >>> CNPJ.clean(b'58.414.462/0001-35')
+        '58414462000135'
+        >>> CNPJ.clean(bytearray(b'58.414.462/0001-35'))
+        '58414462000135'
+        >>> CNPJ.clean(-58414462000135)
+        '58414462000135'
         """
-        if isinstance(cnpj, six.string_types):
-            cnpj = int(re.sub('[^0-9]', '', cnpj))
-
-        return '{0:014d}'.format(cnpj)
+        if isinstance(cnpj, str):
+            digitos = _limpar(cnpj, 14)
+        elif isinstance(cnpj, (bytes, bytearray)):
+            digitos = _limpar_bytes(cnpj, 14).decode('ascii')
+        else:
+            # O sinal não é um dígito: como na limpeza de strings, apenas o valor absoluto é mantido.
+            return '{0:014d}'.format(abs(cnpj))
+
+        if not digitos:
+            raise ValueError("Invalid literal for CNPJ: {0!r}".format(cnpj))
+        return digitos
 
     @classmethod
     def validate(cls, cnpj):
@@ -153,22 +374,23 @@ class CNPJ(CommonEqualityMixin):
         True
         >>> CNPJ.validate('58.414.462/0001-35')
         True
+        >>> CNPJ.validate(b'58.414.462/0001-35')
+        True
         """
         if cnpj is None:
             return False
 
-        digitos_validacao = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
-
-        cnpj = CNPJ.clean(cnpj)
-
-        def mod11(value):
-            value = value % 11
-            return 11 - value if value > 1 else 0
+        if isinstance(cnpj, (bytes, bytearray)):
+            dados = _limpar_bytes(cnpj, 14)
+            if dados:
+                return _validar_cnpj(dados)
+            # Sem nenhum dígito, clean levanta o ValueError.
 
-        dig1 = mod11(sum([digitos_validacao[i] * int(cnpj[i - 1]) for i in range(1, 13)]))
-        dig2 = mod11(sum([digitos_validacao[i] * int(cnpj[i]) for i in range(0, 13)]))
+        return _validar_cnpj(CNPJ.clean(cnpj).encode('ascii'))
 
-        return cnpj[-2:] == '{0}{1}'.format(dig1, dig2)
+    def __eq__(self, other):
+        u"""Comparação de igualdade pelo valor do CNPJ; os demais atributos são derivados dele."""
+        return isinstance(other, self.__class__) and self._cnpj == other._cnpj
 
     def __format__(self, format_spec):
         u"""
@@ -182,15 +404,20 @@ class CNPJ(CommonEqualityMixin):
         >>> '{0} {0:r} {0:f}'.format(cnpj)
         '58.414.462/0001-35 58414462000135 58.414.462/0001-35'
         """
-        return self.format(format_spec)
+        try:
+            formato = self._FORMATOS[format_spec]
+        except KeyError:
+            raise ValueError(
+                "Unknown format code '{0}' for object of type '{1}'".format(format_spec, CNPJ.__name__)) from None
+        return formato(self)
 
     def __repr__(self):
         u"""Reprentação do CNPJ."""
-        return '<CNPJ: {0:f}>'.format(self)
+        return '<CNPJ: {0}>'.format(self._formatar())
 
     def __str__(self):
         u"""Reprentação do CNPJ em string."""
-        return self.format()
+        return self._formatar()
 
 
 class CPF(CommonEqualityMixin):
@@ -235,21 +462,49 @@ class CPF(CommonEqualityMixin):
     '000.000.000-00'
     >>> cpf.format('r')
     '00000000000'
+    >>> CPF('581.194.436-59') == CPF(58119443659)
+    True
+    >>> CPF(58119443659) != CPF()
+    True
     """
 
+    __slots__ = ('_cpf', '_formatted', '_valid')
+
     def __init__(self, cpf=0):
         u"""Inicia um CPF."""
+        if isinstance(cpf, int) and cpf == 0:
+            self._cpf = _CPF_ZERO
+            self._formatted = '000.000.000-00'
+            self._valid = True
+            return
+
+        # A formatação e a validação só são calculadas no primeiro uso, veja `_formatar` e `valid`.
         self._cpf = CPF.clean(cpf)
 
+    def _formatar(self):
+        u"""CPF formatado, calculado no primeiro uso."""
+        try:
+            return self._formatted
+        except AttributeError:
+            cpf = self._cpf
+            self._formatted = formatted = cpf[0:3] + '.' + cpf[3:6] + '.' + cpf[6:9] + '-' + cpf[9:11]
+            return formatted
+
+    _FORMATOS = {'': _formatar, 'f': _formatar, 'r': attrgetter('_cpf')}
+
     @property
     def empty(self):
         u"""Flag indicando que o valor está em branco."""
-        return int(self._cpf) == 0
+        return self._cpf == _CPF_ZERO
 
     @property
     def valid(self):
         u"""Flag indicando que o valor está válido."""
-        return CPF.validate(self._cpf)
+        try:
+            return self._valid
+        except AttributeError:
+            self._valid = valid = _validar_cpf(self._cpf.encode('ascii'))
+            return valid
 
     def format(self, format_spec='f'):
         u"""
@@ -264,14 +519,12 @@ class CPF(CommonEqualityMixin):
         '58119443659'
         >>> cpf.format('f')
         '581.194.436-59'
+        >>> cpf.format('x')
+        Traceback (most recent call last):
+            ...
+        ValueError: Unknown format code 'x' for object of type 'CPF'
         """
-        if format_spec == '' or format_spec == 'f':
-            cpf = CPF.clean(self._cpf)
-            return '{0}.{1}.{2}-{3}'.format(cpf[0:3], cpf[3:6], cpf[6:9], cpf[9:11])
-        if format_spec == 'r':
-            return self._cpf
-        raise ValueError(
-            "Unknown format code '{0}' for object of type '{1}'".format(format_spec, CPF.__name__))
+        return self.__format__(format_spec)
 
     @classmethod
     def clean(cls, cpf):
@@ -280,11 +533,24 @@ class CPF(CommonEqualityMixin):
 
         >>> CPF.clean('581.194.436-59')
         '58119443659'
+        >>> CPF.clean(b'581.194.436-59')
+        '58119443659'
+        >>> CPF.clean(bytearray(b'581.194.436-59'))
+        '58119443659'
+        >>> CPF.clean(-58119443659)
+        '58119443659'
         """
-        if isinstance(cpf, six.string_types):
-            cpf = int(re.sub('[^0-9]', '', cpf))
-
-        return '{0:011d}'.format(cpf)
+        if isinstance(cpf, str):
+            digitos = _limpar(cpf, 11)
+        elif isinstance(cpf, (bytes, bytearray)):
+            digitos = _limpar_bytes(cpf, 11).decode('ascii')
+        else:
+            # O sinal não é um dígito: como na limpeza de strings, apenas o valor absoluto é mantido.
+            return '{0:011d}'.format(abs(cpf))
+
+        if not digitos:
+            raise ValueError("Invalid literal for CPF: {0!r}".format(cpf))
+        return digitos
 
     @classmethod
     def validate(cls, cpf):
@@ -299,19 +565,23 @@ class CPF(CommonEqualityMixin):
         True
         >>> CPF.validate('581.194.436-59')
         True
+        >>> CPF.validate(b'581.194.436-59')
+        True
         """
         if cpf is None:
             return False
 
-        cpf = CPF.clean(cpf)
-
-        def mod11(value):
-            return (value % 11) % 10
+        if isinstance(cpf, (bytes, bytearray)):
+            dados = _limpar_bytes(cpf, 11)
+            if dados:
+                return _validar_cpf(dados)
+            # Sem nenhum dígito, clean levanta o ValueError.
 
-        dig1 = mod11(sum([(i + 1) * int(cpf[i]) for i in range(0, 9)]))
-        dig2 = mod11(sum([i * int(cpf[i]) for i in range(1, 10)]))
+        return _validar_cpf(CPF.clean(cpf).encode('ascii'))
 
-        return cpf[-2:] == '{0}{1}'.format(dig1, dig2)
+    def __eq__(self, other):
+        u"""Comparação de igualdade pelo valor do CPF; os demais atributos são derivados dele."""
+        return isinstance(other, self.__class__) and self._cpf == other._cpf
 
     def __format__(self, format_spec):
         u"""
@@ -325,12 +595,17 @@ class CPF(CommonEqualityMixin):
         >>> '{0} {0:r} {0:f}'.format(cpf)
         '581.194.436-59 58119443659 581.194.436-59'
         """
-        return self.format(format_spec)
+        try:
+            formato = self._FORMATOS[format_spec]
+        except KeyError:
+            raise ValueError(
+                "Unknown format code '{0}' for object of type '{1}'".format(format_spec, CPF.__name__)) from None
+        return formato(self)
 
     def __repr__(self):
         u"""Reprentação do CPF."""
-        return '<CPF: {0:f}>'.format(self)
+        return '<CPF: {0}>'.format(self._formatar())
 
     def __str__(self):
         u"""Reprentação do CPF em string."""
-        return self.format()
+        return self._formatar()
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+u"""Configuração do pytest."""
+
+collect_ignore = []
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    collect_ignore.append('brazil_types/arrays.py')
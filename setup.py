@@ -1,10 +1,28 @@
 # -*- coding: utf-8 -*-
 u"""Instalation files for brazil-types."""
 
-from setuptools import setup, find_packages
+import os
+
+from setuptools import setup, find_packages, Extension
 from setuptools.command.test import test as test_command
 from brazil_types import __version__
 
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    # Sem Cython usa o _fast.c distribuído no sdist; sem ele a biblioteca é instalada apenas com a
+    # implementação em python puro.
+    if os.path.exists('brazil_types/_fast.c'):
+        ext_modules = [Extension('brazil_types._fast', ['brazil_types/_fast.c'], optional=True)]
+    else:
+        ext_modules = []
+else:
+    ext_modules = cythonize([Extension('brazil_types._fast', ['brazil_types/_fast.pyx'])])
+    # Sem compilador C a instalação segue só com a implementação em python puro. O cythonize não preserva o
+    # optional passado ao Extension, por isso ele é ligado depois.
+    for ext in ext_modules:
+        ext.optional = True
+
 
 class PyTest(test_command):
     u"""Helper class to execute unit tests."""
@@ -47,14 +65,15 @@ setup(
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: 3.4',
         'Programming Language :: Python :: 3.5',
     ],
     keywords='brazil types receita federal',
-    install_requires=['six'],
+    python_requires='>=3.4',
+    extras_require={'numpy': ['numpy'], 'numba': ['numba']},
     tests_require=['pytest'],
+    ext_modules=ext_modules,
     cmdclass={'test': PyTest},
 )